@@ -3,11 +3,24 @@ from tkinter import scrolledtext, messagebox, simpledialog, Listbox
 import random
 import json
 import os
+from functools import partial
+
+try:
+    import orjson # Optional C-accelerated JSON; falls back to the stdlib json module
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit # Optional JIT for the headless combat simulation
+except ImportError:
+    def njit(*args, **kwargs):
+        return lambda func: func
 
 # --- Core Game Classes ---
 
 class Entity:
     """Base class for player and enemies."""
+    __slots__ = ('name', 'max_hp', 'hp', 'max_stamina', 'stamina', 'attack', 'defense', 'is_defending')
     def __init__(self, name, hp, stamina, attack, defense):
         self.name = name
         self.max_hp = hp
@@ -22,11 +35,10 @@ class Entity:
         return self.hp > 0
 
     def take_damage(self, damage):
-        if self.is_defending:
-            damage = max(0, damage // 2) # Halve damage if defending
-            self.is_defending = False # Defense only lasts for one turn
-        
-        actual_damage = max(0, damage - self.defense)
+        actual_damage = (damage >> self.is_defending) - self.defense # Shifting by True halves damage if defending
+        self.is_defending = False # Defense only lasts for one turn
+        if actual_damage < 0:
+            actual_damage = 0
         self.hp -= actual_damage
         if self.hp < 0:
             self.hp = 0
@@ -34,10 +46,13 @@ class Entity:
 
 class Player(Entity):
     """Player character class."""
+    __slots__ = ('xp', 'level', 'xp_to_next', 'inventory', 'weapon', 'armor', 'location', 'quests',
+                 'max_mana', 'mana', 'spells', '_inv_by_name', '_inventory_names', '_potions')
     def __init__(self, name, hp, stamina, attack, defense):
         super().__init__(name, hp, stamina, attack, defense)
         self.xp = 0
         self.level = 1
+        self.xp_to_next = 100
         self.inventory = []
         self.weapon = None
         self.armor = None
@@ -46,21 +61,47 @@ class Player(Entity):
         self.max_mana = 30
         self.mana = 30
         self.spells = []
+        self._inv_by_name = {} # Item name -> list of matching items in the inventory
+        self._inventory_names = [] # Parallel to inventory, emitted as-is by to_dict
+        self._potions = [] # Potions in the inventory, for the combat item menu
 
     def add_item(self, item):
         self.inventory.append(item)
+        self._inventory_names.append(item.name)
+        self._inv_by_name.setdefault(item.name, []).append(item)
+        if item.kind == "potion":
+            self._potions.append(item)
 
     def remove_item(self, item):
-        self.inventory.remove(item)
+        index = self.inventory.index(item)
+        del self.inventory[index]
+        del self._inventory_names[index]
+        same_name = self._inv_by_name[item.name]
+        same_name.remove(item)
+        if not same_name:
+            del self._inv_by_name[item.name]
+        if item.kind == "potion":
+            self._potions.remove(item)
+
+    def has_item(self, name):
+        # Keys of the name index are exactly the names currently held, duplicates included once
+        return name in self._inv_by_name
+
+    def find_item(self, name):
+        """Return the first inventory item with this name, or None."""
+        return self._inv_by_name.get(name, [None])[0]
+
+    def get_potions(self):
+        return self._potions
 
     def equip_item(self, item):
         # Unequip previous item and remove its stats before equipping the new one
-        if isinstance(item, Weapon):
+        if item.kind == "weapon":
             if self.weapon:
                 self.attack -= self.weapon.attack_bonus
             self.weapon = item
             self.attack += item.attack_bonus
-        elif isinstance(item, Armor):
+        elif item.kind == "armor":
             if self.armor:
                 self.defense -= self.armor.defense_bonus
             self.armor = item
@@ -68,12 +109,13 @@ class Player(Entity):
 
     def gain_xp(self, amount):
         self.xp += amount
-        if self.xp >= self.level * 100:
+        if self.xp >= self.xp_to_next:
             self.level_up()
 
     def level_up(self):
         self.level += 1
         self.xp = 0
+        self.xp_to_next = self.level * 100
         self.max_hp += 20
         self.hp = self.max_hp
         self.max_stamina += 10
@@ -92,7 +134,7 @@ class Player(Entity):
             'mana': self.mana, 'max_mana': self.max_mana,
             'attack': self.attack, 'defense': self.defense, 'xp': self.xp,
             'level': self.level, 'location': self.location,
-            'inventory': [item.name for item in self.inventory],
+            'inventory': list(self._inventory_names),
             'weapon': self.weapon.name if self.weapon else None,
             'armor': self.armor.name if self.armor else None,
             'quests': {k: v.to_dict() for k, v in self.quests.items()},
@@ -110,6 +152,7 @@ class Player(Entity):
         player.max_mana = data['max_mana']
         player.xp = data['xp']
         player.level = data['level']
+        player.xp_to_next = player.level * 100
         player.location = data['location']
         
         # Restore base stats from level
@@ -117,15 +160,17 @@ class Player(Entity):
         player.defense = 3 + (player.level * 2)
 
         # Re-create and equip items from data
-        inventory_items = [create_item_from_name(item_name) for item_name in data['inventory']]
-        player.inventory = [item for item in inventory_items if item]
+        for item_name in data['inventory']:
+            item = create_item_from_name(item_name)
+            if item:
+                player.add_item(item) # Keeps the name index in sync
         
         if data['weapon']:
-            weapon_to_equip = next((item for item in player.inventory if item.name == data['weapon']), None)
+            weapon_to_equip = player.find_item(data['weapon'])
             if weapon_to_equip:
                 player.equip_item(weapon_to_equip)
         if data['armor']:
-            armor_to_equip = next((item for item in player.inventory if item.name == data['armor']), None)
+            armor_to_equip = player.find_item(data['armor'])
             if armor_to_equip:
                 player.equip_item(armor_to_equip)
 
@@ -139,6 +184,7 @@ class Player(Entity):
 
 class Enemy(Entity):
     """Enemy character class."""
+    __slots__ = ('xp_reward',)
     def __init__(self, name, hp, stamina, attack, defense, xp_reward):
         super().__init__(name, hp, stamina, attack, defense)
         self.xp_reward = xp_reward
@@ -147,12 +193,16 @@ class Enemy(Entity):
 
 class Item:
     """Base class for items."""
+    __slots__ = ('name', 'description')
+    kind = "misc" # Item category tag, checked instead of isinstance
     def __init__(self, name, description):
         self.name = name
         self.description = description
 
 class Potion(Item):
     """Potion item class."""
+    __slots__ = ('effect', 'amount')
+    kind = "potion"
     def __init__(self, name, description, effect, amount):
         super().__init__(name, description)
         self.effect = effect
@@ -160,18 +210,23 @@ class Potion(Item):
 
 class Weapon(Item):
     """Weapon item class."""
+    __slots__ = ('attack_bonus',)
+    kind = "weapon"
     def __init__(self, name, description, attack_bonus):
         super().__init__(name, description)
         self.attack_bonus = attack_bonus
 
 class Armor(Item):
     """Armor item class."""
+    __slots__ = ('defense_bonus',)
+    kind = "armor"
     def __init__(self, name, description, defense_bonus):
         super().__init__(name, description)
         self.defense_bonus = defense_bonus
         
 class Spell:
     """Spell class."""
+    __slots__ = ('name', 'description', 'mana_cost', 'damage')
     def __init__(self, name, description, mana_cost, damage):
         self.name = name
         self.description = description
@@ -182,6 +237,7 @@ class Spell:
 
 class Quest:
     """Quest class with stages."""
+    __slots__ = ('name', 'description', 'stages', 'current_stage', 'reward', 'completed', '_dirty', '_cached_dict')
     def __init__(self, name, description, stages, reward):
         self.name = name
         self.description = description
@@ -189,11 +245,14 @@ class Quest:
         self.current_stage = 0
         self.reward = reward
         self.completed = False
+        self._dirty = True # Set whenever progress changes; to_dict reuses its last output otherwise
+        self._cached_dict = None
 
     def get_current_stage_info(self):
         return self.stages[self.current_stage]
 
     def advance_stage(self):
+        self._dirty = True
         if self.current_stage < len(self.stages) - 1:
             self.current_stage += 1
             return False # Not completed yet
@@ -202,13 +261,18 @@ class Quest:
             return True # Quest completed
 
     def to_dict(self):
-        return {'name': self.name, 'description': self.description, 'stages': self.stages, 'current_stage': self.current_stage, 'reward': self.reward, 'completed': self.completed}
+        """Return the cached serialized quest; callers must not modify it, later saves reuse the same dict."""
+        if self._dirty:
+            self._cached_dict = {'name': self.name, 'description': self.description, 'stages': self.stages, 'current_stage': self.current_stage, 'reward': self.reward, 'completed': self.completed}
+            self._dirty = False
+        return self._cached_dict
 
     @classmethod
     def from_dict(cls, data):
         quest = cls(data['name'], data['description'], data['stages'], data['reward'])
         quest.current_stage = data['current_stage']
         quest.completed = data['completed']
+        quest._dirty = True # Progress was restored directly, bypassing advance_stage
         return quest
 
 
@@ -322,21 +386,56 @@ npcs = {
 }
 
 # --- Helper Functions ---
+
+# Per-name constructors with their arguments bound once at import
+_ITEM_FACTORIES = {name: partial(spec["class"], name, **spec["args"]) for name, spec in items.items()}
+_SPELL_FACTORIES = {name: partial(Spell, name, **spec) for name, spec in spells.items()}
+
+ENCOUNTER_CHANCE = 0.6
+
+# Exits and location text never change, so freeze each location's (direction, destination)
+# pairs and its header+description log text once.
+for _loc_data in world.values():
+    _loc_data['_exits'] = tuple(_loc_data['exits'].items())
+    _loc_data['_text'] = f"\n--- {_loc_data['name']} ---\n{_loc_data['description']}"
+
+# Pre-formatted NPC dialogue lines, keyed by quest stage like 'dialogue'
+for _npc_name, _npc_data in npcs.items():
+    _npc_data['_lines'] = {stage: f"\n{_npc_name}: {text}" for stage, text in _npc_data['dialogue'].items()}
+
 def create_item_from_name(name):
-    if name in items:
-        item_data = items[name]
-        return item_data["class"](name, **item_data["args"])
-    return None
+    factory = _ITEM_FACTORIES.get(name)
+    return factory() if factory else None
 
 def create_spell_from_name(name):
-    if name in spells:
-        return Spell(name, **spells[name])
-    return None
+    factory = _SPELL_FACTORIES.get(name)
+    return factory() if factory else None
+
+@njit(cache=True)
+def resolve_turns(p_hp, p_atk, p_def, p_is_def, e_hp, e_atk, e_def, n_turns):
+    """Run up to n_turns attack exchanges with take_damage's rules and return the final (player HP, enemy HP)."""
+    for _ in range(n_turns):
+        damage = p_atk - e_def
+        if damage < 0:
+            damage = 0
+        e_hp -= damage
+        if e_hp <= 0:
+            return p_hp, 0
+        damage = (e_atk >> p_is_def) - p_def
+        p_is_def = 0
+        if damage < 0:
+            damage = 0
+        p_hp -= damage
+        if p_hp <= 0:
+            return 0, e_hp
+    return p_hp, e_hp
 
 # --- Main Game Application ---
 
 class Game(tk.Tk):
     SAVE_FILE = "rpg_save.json"
+    PRETTY_SAVE_FILE = "rpg_save_pretty.json"
+    _STATS_FMT = "HP: {}/{} | MP: {}/{} | Stamina: {}/{} | Level: {} | XP: {}/{}" # Filled from update_stats' tuple
 
     def __init__(self):
         super().__init__()
@@ -344,7 +443,12 @@ class Game(tk.Tk):
         self.geometry("800x600")
 
         self.player = None
+        self._loc = None # world entry for the player's current location
         self.current_enemy = None
+        self._last_stats_tuple = None
+        self.rng = random.Random()
+        self._log_buf = [] # Messages waiting for the next idle flush into the text area
+        self._flush_id = None # Pending after_idle id for _flush_log
 
         self.create_widgets()
         self.show_start_menu()
@@ -361,29 +465,55 @@ class Game(tk.Tk):
         self.stats_label = tk.Label(self.stats_frame, text="", bg='black', fg='white', font=("Courier", 10))
         self.stats_label.pack()
 
+        # Buttons are created once and re-packed per screen; clear_buttons only hides them.
+        # Location-dependent commands read self._loc when clicked, so only their text changes per screen.
+        self._new_game_button = tk.Button(self.button_frame, text="New Game", command=self.new_game)
+        self._load_game_button = tk.Button(self.button_frame, text="Load Game", command=self.load_game)
+        max_exits = max(len(loc['exits']) for loc in world.values())
+        self._loc_buttons = [tk.Button(self.button_frame, command=lambda i=i: self.move_player(self._loc['_exits'][i][1]))
+                             for i in range(max_exits)]
+        self._npc_button = tk.Button(self.button_frame, command=lambda: self.talk_to_npc(self._loc['npc']))
+        self._search_button = tk.Button(self.button_frame, text="Search Area", command=self.search_area)
+        self._inventory_button = tk.Button(self.button_frame, text="Inventory", command=self.open_inventory_screen)
+        self._save_button = tk.Button(self.button_frame, text="Save Game", command=self.save_game)
+        self._export_button = tk.Button(self.button_frame, text="Export Pretty JSON", command=self.export_pretty_save)
+        self._combat_buttons = [tk.Button(self.button_frame, text=action, command=lambda a=action: self.perform_action(a))
+                                for action in ("Attack", "Defend", "Magic", "Use Item", "Flee")]
+
     def log(self, message):
+        self._log_buf.append(message)
+        if self._flush_id is None:
+            self._flush_id = self.after_idle(self._flush_log)
+
+    def _flush_log(self):
+        # Also called directly before modal dialogs, so drop the pending idle flush
+        self.after_cancel(self._flush_id)
+        self._flush_id = None
         self.text_area.config(state='normal')
-        self.text_area.insert(tk.END, message + "\n")
+        self.text_area.insert(tk.END, "\n".join(self._log_buf) + "\n")
         self.text_area.config(state='disabled')
         self.text_area.yview(tk.END)
+        self._log_buf.clear()
 
     def update_stats(self):
         if not self.player: return
-        stats = (f"HP: {self.player.hp}/{self.player.max_hp} | "
-                 f"MP: {self.player.mana}/{self.player.max_mana} | "
-                 f"Stamina: {self.player.stamina}/{self.player.max_stamina} | "
-                 f"Level: {self.player.level} | XP: {self.player.xp}/{self.player.level*100}")
-        self.stats_label.config(text=stats)
+        p = self.player
+        stats_tuple = (p.hp, p.max_hp, p.mana, p.max_mana, p.stamina, p.max_stamina, p.level, p.xp, p.xp_to_next)
+        if stats_tuple == self._last_stats_tuple:
+            return # Nothing changed, skip the label update
+        self._last_stats_tuple = stats_tuple
+        self.stats_label.config(text=self._STATS_FMT.format(*stats_tuple))
         
     def show_start_menu(self):
         self.clear_buttons()
         self.log("Welcome to the Souls-Like RPG!")
-        tk.Button(self.button_frame, text="New Game", command=self.new_game).pack(side=tk.LEFT, padx=5)
+        self._new_game_button.pack(side=tk.LEFT, padx=5)
         if os.path.exists(self.SAVE_FILE):
-            tk.Button(self.button_frame, text="Load Game", command=self.load_game).pack(side=tk.LEFT, padx=5)
+            self._load_game_button.pack(side=tk.LEFT, padx=5)
 
     def new_game(self):
         self.player = Player("Hero", 100, 50, 15, 5)
+        self._loc = world[self.player.location]
         self.player.add_item(create_item_from_name("Health Potion"))
         self.player.equip_item(create_item_from_name("Iron Sword"))
         self.player.equip_item(create_item_from_name("Leather Armor"))
@@ -393,16 +523,33 @@ class Game(tk.Tk):
 
     def save_game(self):
         if not self.player: return
-        with open(self.SAVE_FILE, 'w') as f:
-            json.dump(self.player.to_dict(), f, indent=4)
+        if orjson:
+            with open(self.SAVE_FILE, 'wb') as f:
+                f.write(orjson.dumps(self.player.to_dict()))
+        else:
+            with open(self.SAVE_FILE, 'w') as f:
+                json.dump(self.player.to_dict(), f, separators=(',', ':'))
         self.log("\nGame saved.")
+        self._flush_log()
         messagebox.showinfo("Save Game", "Your progress has been saved.")
 
+    def export_pretty_save(self):
+        """Write an indented copy of the save for manual inspection."""
+        if not self.player: return
+        with open(self.PRETTY_SAVE_FILE, 'w') as f:
+            json.dump(self.player.to_dict(), f, indent=4)
+        self.log(f"\nSave exported to {self.PRETTY_SAVE_FILE}.")
+
     def load_game(self):
         if os.path.exists(self.SAVE_FILE):
-            with open(self.SAVE_FILE, 'r') as f:
-                player_data = json.load(f)
-                self.player = Player.from_dict(player_data)
+            if orjson:
+                with open(self.SAVE_FILE, 'rb') as f:
+                    player_data = orjson.loads(f.read())
+            else:
+                with open(self.SAVE_FILE, 'r') as f:
+                    player_data = json.load(f)
+            self.player = Player.from_dict(player_data)
+            self._loc = world[self.player.location]
             self.log("\nGame loaded. Welcome back.")
             self.show_location()
         else:
@@ -410,34 +557,36 @@ class Game(tk.Tk):
 
     def show_location(self):
         self.update_stats()
-        location_data = world[self.player.location]
-        self.log(f"\n--- {location_data['name']} ---")
-        self.log(location_data['description'])
+        location_data = self._loc
+        self.log(location_data['_text'])
         
         self.create_location_buttons()
 
-        if "enemies" in location_data and random.random() < 0.6:
-            self.start_combat(random.choice(location_data['enemies']))
+        if "enemies" in location_data and self.rng.random() < ENCOUNTER_CHANCE:
+            self.start_combat(self.rng.choice(location_data['enemies']))
 
     def create_location_buttons(self):
         self.clear_buttons()
-        location_data = world[self.player.location]
+        location_data = self._loc
         
         # Movement buttons
-        for direction, destination in location_data['exits'].items():
-            tk.Button(self.button_frame, text=f"Go {direction.capitalize()}", command=lambda d=destination: self.move_player(d)).pack(side=tk.LEFT, padx=5)
+        for btn, (direction, _) in zip(self._loc_buttons, location_data['_exits']):
+            btn.config(text=f"Go {direction.capitalize()}")
+            btn.pack(side=tk.LEFT, padx=5)
             
         # NPC button
         if "npc" in location_data:
-            tk.Button(self.button_frame, text=f"Talk to {location_data['npc']}", command=lambda n=location_data['npc']: self.talk_to_npc(n)).pack(side=tk.LEFT, padx=5)
+            self._npc_button.config(text=f"Talk to {location_data['npc']}")
+            self._npc_button.pack(side=tk.LEFT, padx=5)
         
         # Secret/Search button
         if "secret" in location_data:
-            tk.Button(self.button_frame, text="Search Area", command=self.search_area).pack(side=tk.LEFT, padx=5)
+            self._search_button.pack(side=tk.LEFT, padx=5)
             
         # System buttons
-        tk.Button(self.button_frame, text="Inventory", command=self.open_inventory_screen).pack(side=tk.RIGHT, padx=5)
-        tk.Button(self.button_frame, text="Save Game", command=self.save_game).pack(side=tk.RIGHT, padx=5)
+        self._inventory_button.pack(side=tk.RIGHT, padx=5)
+        self._save_button.pack(side=tk.RIGHT, padx=5)
+        self._export_button.pack(side=tk.RIGHT, padx=5)
 
     def open_inventory_screen(self):
         inv_win = tk.Toplevel(self)
@@ -479,7 +628,7 @@ class Game(tk.Tk):
                 widget.destroy()
 
             selected_item_name = inv_listbox.get(selected_indices[0]).split(" (")[0]
-            selected_item = next((item for item in self.player.inventory if item.name == selected_item_name), None)
+            selected_item = self.player.find_item(selected_item_name)
 
             if not selected_item:
                 return
@@ -487,9 +636,9 @@ class Game(tk.Tk):
             desc_label.config(text=selected_item.description)
 
             # Define actions based on item type
-            if isinstance(selected_item, (Weapon, Armor)):
+            if selected_item.kind in ("weapon", "armor"):
                 tk.Button(action_frame, text="Equip", command=lambda: equip_action(selected_item)).pack(fill=tk.X)
-            if isinstance(selected_item, Potion):
+            if selected_item.kind == "potion":
                 tk.Button(action_frame, text="Use", command=lambda: use_action(selected_item)).pack(fill=tk.X)
             tk.Button(action_frame, text="Drop", command=lambda: drop_action(selected_item)).pack(fill=tk.X)
 
@@ -528,14 +677,15 @@ class Game(tk.Tk):
 
     def move_player(self, destination):
         self.player.location = destination
+        self._loc = world[destination]
         self.show_location()
 
     def search_area(self):
-        location_data = world[self.player.location]
+        location_data = self._loc
         secret = location_data.get("secret")
         if secret == "Found an Amulet":
             amulet = create_item_from_name("Amulet of the Forest")
-            if not any(isinstance(item, Item) and item.name == amulet.name for item in self.player.inventory):
+            if not self.player.has_item(amulet.name):
                 self.player.add_item(amulet)
                 self.log(f"You search the area and find the {amulet.name}!")
                 self.check_quest_progress()
@@ -554,23 +704,18 @@ class Game(tk.Tk):
         
         # Get current dialogue
         quest = self.player.quests[quest_name]
-        dialogue = npc_data['dialogue'].get(quest.current_stage, "...")
-        self.log(f"\n{npc_name}: {dialogue}")
+        self.log(npc_data['_lines'].get(quest.current_stage, f"\n{npc_name}: ..."))
         self.log(f"Current Objective: {quest.get_current_stage_info()['target_description']}")
 
     def start_combat(self, enemy_name):
-        enemy_data = enemies[enemy_name]
-        self.current_enemy = Enemy(enemy_name, **enemy_data)
+        self.current_enemy = Enemy(enemy_name, **enemies[enemy_name])
         self.log(f"\nA wild {self.current_enemy.name} appears!")
         self.create_combat_buttons()
 
     def create_combat_buttons(self):
         self.clear_buttons()
-        tk.Button(self.button_frame, text="Attack", command=lambda: self.perform_action("Attack")).pack(side=tk.LEFT, padx=5)
-        tk.Button(self.button_frame, text="Defend", command=lambda: self.perform_action("Defend")).pack(side=tk.LEFT, padx=5)
-        tk.Button(self.button_frame, text="Magic", command=lambda: self.perform_action("Magic")).pack(side=tk.LEFT, padx=5)
-        tk.Button(self.button_frame, text="Use Item", command=lambda: self.perform_action("Use Item")).pack(side=tk.LEFT, padx=5)
-        tk.Button(self.button_frame, text="Flee", command=lambda: self.perform_action("Flee")).pack(side=tk.LEFT, padx=5)
+        for btn in self._combat_buttons:
+            btn.pack(side=tk.LEFT, padx=5)
 
     def perform_action(self, action):
         if not self.current_enemy or not self.current_enemy.is_alive():
@@ -592,8 +737,6 @@ class Game(tk.Tk):
         if player_turn_ended and self.current_enemy and self.current_enemy.is_alive():
             self.enemy_turn()
 
-        self.update_stats()
-
     def player_attack(self):
         damage_done = self.current_enemy.take_damage(self.player.attack)
         self.log(f"You attack the {self.current_enemy.name} for {damage_done} damage.")
@@ -629,12 +772,11 @@ class Game(tk.Tk):
             
             if self.current_enemy and self.current_enemy.is_alive():
                 self.enemy_turn()
-            self.update_stats()
         else:
             self.log("Not enough mana!")
 
     def show_item_selection(self):
-        potions = [item for item in self.player.inventory if isinstance(item, Potion)]
+        potions = self.player.get_potions()
         if not potions:
             self.log("You have no potions to use.")
             return False
@@ -660,10 +802,9 @@ class Game(tk.Tk):
         
         if self.current_enemy and self.current_enemy.is_alive():
             self.enemy_turn()
-        self.update_stats()
 
     def flee(self):
-        if random.random() < 0.5:
+        if self.rng.random() < 0.5:
             self.log("You successfully fled the battle.")
             self.current_enemy = None
             self.show_location()
@@ -674,9 +815,24 @@ class Game(tk.Tk):
     def enemy_turn(self):
         damage_done = self.player.take_damage(self.current_enemy.attack)
         self.log(f"The {self.current_enemy.name} attacks you for {damage_done} damage.")
+        self.update_stats()
         if not self.player.is_alive():
             self.game_over()
 
+    def auto_battle(self, n_turns):
+        """Resolve up to n_turns of the current fight without player input (used for balancing)."""
+        if not self.current_enemy or not self.current_enemy.is_alive():
+            return
+        p, e = self.player, self.current_enemy
+        p.hp, e.hp = resolve_turns(p.hp, p.attack, p.defense, int(p.is_defending), e.hp, e.attack, e.defense, n_turns)
+        p.is_defending = False
+        self.log(f"Auto-battle: you have {p.hp} HP left, the {e.name} has {e.hp} HP left.")
+        self.update_stats()
+        if not e.is_alive():
+            self.win_combat()
+        elif not p.is_alive():
+            self.game_over()
+
     def win_combat(self):
         self.log(f"You defeated the {self.current_enemy.name}!")
         self.player.gain_xp(self.current_enemy.xp_reward)
@@ -692,7 +848,7 @@ class Game(tk.Tk):
             progress = False
             if stage['type'] == 'kill_enemy' and stage['enemy'] == defeated_enemy:
                 progress = True
-            elif stage['type'] == 'find_item' and any(item.name == stage['item'] for item in self.player.inventory):
+            elif stage['type'] == 'find_item' and self.player.has_item(stage['item']):
                 progress = True
 
             if progress:
@@ -712,12 +868,13 @@ class Game(tk.Tk):
 
     def game_over(self):
         self.log("\nYou have been defeated. Game Over.")
+        self._flush_log()
         messagebox.showinfo("Game Over", "You have been defeated.")
         self.destroy()
 
     def clear_buttons(self):
         for widget in self.button_frame.winfo_children():
-            widget.destroy()
+            widget.pack_forget()
 
 if __name__ == "__main__":
     game = Game()